@@ -1,4 +1,4 @@
-"""pytest-threaded: Run pytest tests concurrently using ThreadPoolExecutor."""
+"""pytest-threaded: Run pytest tests concurrently using a pool of worker threads."""
 
 from pytest_threaded.runner import (
     ConcurrentTestRunner,
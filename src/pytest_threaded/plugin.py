@@ -1,9 +1,39 @@
 """pytest plugin entry point for pytest-threaded."""
 
-# Re-export the cleanup fixture so pytest can discover it
-pytest_plugins = []
+import pytest
+
+
+def pytest_addoption(parser):
+    """Register pytest-threaded ini options."""
+    parser.addini(
+        "threaded_pin_workers",
+        type="bool",
+        default=False,
+        help="Pin each pytest-threaded worker thread to its own CPU (Linux only).",
+    )
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_load_initial_conftests(early_config, parser, args):
+    """Install the thread-local streams before pytest starts capturing output.
+
+    pytest's capture restores whatever sys.stdout was when it started, so the
+    streams must already be in place for worker redirects to survive it. The
+    cleanup is registered before capture starts, so it runs after capture stops
+    (cleanups run last-in, first-out) and the real streams end up restored.
+    """
+    from pytest_threaded.runner import _install_streams, _uninstall_streams
+
+    _install_streams()
+    early_config.add_cleanup(_uninstall_streams)
+    yield
 
 
 def pytest_configure(config):
-    """Register the pytest-threaded plugin marker."""
+    """Register the pytest-threaded marker and apply ini options."""
     config.addinivalue_line("markers", "concurrent: mark test for concurrent execution")
+
+    if config.getini("threaded_pin_workers"):
+        from pytest_threaded.runner import _runner
+
+        _runner.pin_workers = True
@@ -1,56 +1,73 @@
 """Core concurrent test runner implementation."""
 
+import contextvars
 import inspect
+import io
+import os
 import queue
 import sys
 import threading
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Callable
 
 import pytest
 
-# Thread-local storage
-_thread_local = threading.local()
+# Per-thread output redirects. Worker threads each run in their own context, so
+# a ContextVar behaves like thread-local storage but with a cheaper get().
+_stdout_redirect: contextvars.ContextVar = contextvars.ContextVar("stdout_redirect", default=None)
+_stderr_redirect: contextvars.ContextVar = contextvars.ContextVar("stderr_redirect", default=None)
 
-# Save originals before we replace them
+# The real streams; refreshed when the thread-local streams are installed
 _original_stdout = sys.stdout
 _original_stderr = sys.stderr
+_streams_installed = False
+
+# Enqueued by a worker after its test finishes so wait() can block on get()
+_DONE = object()
 
 
 class ThreadLocalStream:
     """
-    A file-like object that checks thread-local storage for a redirect.
+    A file-like object that checks a per-thread context variable for a redirect.
     If the current thread has set a redirect, write there.
     Otherwise, write to the original stream.
     """
 
-    def __init__(self, original, attr_name):
+    def __init__(self, original, redirect: contextvars.ContextVar):
         self.original = original
-        self.attr_name = attr_name
+        self.redirect = redirect
 
     def write(self, text):
-        redirect = getattr(_thread_local, self.attr_name, None)
+        redirect = self.redirect.get()
         if redirect is not None:
             redirect.write(text)
         else:
             self.original.write(text)
 
     def flush(self):
-        redirect = getattr(_thread_local, self.attr_name, None)
+        redirect = self.redirect.get()
         if redirect is not None:
             redirect.flush()
         else:
             self.original.flush()
 
+    # While redirected, report what an in-memory stream would (like pytest's own
+    # capture) so code in the test doesn't take terminal-only paths
+
     def isatty(self):
+        if self.redirect.get() is not None:
+            return False
         return self.original.isatty()
 
     def fileno(self):
+        if self.redirect.get() is not None:
+            raise io.UnsupportedOperation("fileno")
         return self.original.fileno()
 
     @property
     def encoding(self):
+        if self.redirect.get() is not None:
+            return "utf-8"
         return self.original.encoding
 
     @property
@@ -76,35 +93,71 @@ class ThreadLocalStream:
 
 
 class QueueWriter:
-    """A file-like object that writes to a queue."""
+    """
+    A line-buffered file-like object that writes to a queue.
+    Writes are collected locally and enqueued as one chunk on newline or flush.
+    """
 
-    def __init__(self, q: queue.Queue, stream_name: str):
+    def __init__(self, q: queue.SimpleQueue, stream_name: str):
         self.queue = q
         self.stream_name = stream_name
+        self._buf: list[str] = []
 
     def write(self, text: str):
         if text:
-            self.queue.put((self.stream_name, text))
+            self._buf.append(text)
+            if "\n" in text:
+                self.flush()
 
     def flush(self):
-        pass
+        if self._buf:
+            self.queue.put((self.stream_name, "".join(self._buf)))
+            self._buf.clear()
+
 
+def _install_streams() -> None:
+    """Install the thread-local streams, once, before the first test is dispatched."""
+    global _original_stdout, _original_stderr, _streams_installed
+    if _streams_installed:
+        return
+    _original_stdout = sys.stdout
+    _original_stderr = sys.stderr
+    sys.stdout = ThreadLocalStream(_original_stdout, _stdout_redirect)
+    sys.stderr = ThreadLocalStream(_original_stderr, _stderr_redirect)
+    _streams_installed = True
 
-# Install thread-local streams once at module load
-sys.stdout = ThreadLocalStream(_original_stdout, "stdout_redirect")
-sys.stderr = ThreadLocalStream(_original_stderr, "stderr_redirect")
+
+def _uninstall_streams() -> None:
+    """Restore the real streams, unless something else has replaced ours since.
+
+    If another layer (e.g. pytest's capture) currently sits on top of our
+    streams, they are left marked as installed; under pytest the plugin calls
+    this again at config cleanup, once capture has put our streams back.
+    """
+    global _streams_installed
+    if not _streams_installed:
+        return
+    if isinstance(sys.stdout, ThreadLocalStream) and isinstance(sys.stderr, ThreadLocalStream):
+        sys.stdout = _original_stdout
+        sys.stderr = _original_stderr
+        _streams_installed = False
 
 
 @dataclass
 class _TestResult:
     """Stores the result of a dispatched test."""
 
-    future: Any = None
-    output_queue: queue.Queue = field(default_factory=queue.Queue)
+    output_queue: queue.SimpleQueue = field(default_factory=queue.SimpleQueue)
     passed: bool = False
-    error: Exception = None
+    error: BaseException = None
     error_tb: Any = None  # Original traceback
     done: threading.Event = field(default_factory=threading.Event)
+    stdout_writer: QueueWriter = field(init=False)
+    stderr_writer: QueueWriter = field(init=False)
+
+    def __post_init__(self):
+        self.stdout_writer = QueueWriter(self.output_queue, "stdout")
+        self.stderr_writer = QueueWriter(self.output_queue, "stderr")
 
 
 class ConcurrentTestRunner:
@@ -112,71 +165,131 @@ class ConcurrentTestRunner:
 
     _instance = None
 
-    def __new__(cls, max_workers=4):
+    def __new__(cls, max_workers=None, pin_workers=False):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance.executor = ThreadPoolExecutor(max_workers=max_workers)
+            cls._instance.max_workers = max_workers
+            cls._instance.pin_workers = pin_workers
+            cls._instance.tasks: queue.SimpleQueue = queue.SimpleQueue()
+            cls._instance.workers: list[threading.Thread] = []
             cls._instance.results: dict[str, _TestResult] = {}
             cls._instance.lock = threading.Lock()
         return cls._instance
 
+    @staticmethod
+    def _worker(tasks: queue.SimpleQueue, cpu: int | None) -> None:
+        """Run dispatched tests until a None task signals shutdown."""
+        if cpu is not None:
+            try:
+                # pid 0 applies to the calling thread only
+                os.sched_setaffinity(0, {cpu})
+            except OSError:
+                pass
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            task()
+
+    def _start_workers(self) -> None:
+        """Start the worker threads on first use, sized to the registered tests.
+
+        Unless max_workers was given, every registered test gets its own worker,
+        capped at ThreadPoolExecutor's default of min(32, cpu_count + 4).
+        With pin_workers set (Linux only), worker i is bound to the i-th CPU
+        this process may run on, wrapping around if there are more workers.
+        """
+        with self.lock:
+            if self.workers:
+                return
+            max_workers = self.max_workers
+            if max_workers is None:
+                default_workers = min(32, (os.cpu_count() or 1) + 4)
+                registered = sum(len(tests) for tests in _concurrent_tests.values())
+                max_workers = max(1, min(registered, default_workers))
+            cpus = None
+            if self.pin_workers and hasattr(os, "sched_setaffinity"):
+                cpus = sorted(os.sched_getaffinity(0))
+            for i in range(max_workers):
+                worker = threading.Thread(
+                    target=self._worker,
+                    args=(self.tasks, cpus[i % len(cpus)] if cpus else None),
+                    name=f"pytest-threaded-{i}",
+                    daemon=True,
+                )
+                worker.start()
+                self.workers.append(worker)
+
     def dispatch(self, name: str, func: Callable, *args, **kwargs) -> None:
-        """Dispatch a test to run in the executor. Returns immediately."""
+        """Dispatch a test to run on a worker thread. Returns immediately."""
         result = _TestResult()
 
         def run_test():
             # Set thread-local redirects (only affects this thread)
-            _thread_local.stdout_redirect = QueueWriter(result.output_queue, "stdout")
-            _thread_local.stderr_redirect = QueueWriter(result.output_queue, "stderr")
+            _stdout_redirect.set(result.stdout_writer)
+            _stderr_redirect.set(result.stderr_writer)
 
             try:
                 func(*args, **kwargs)
                 result.passed = True
-            except Exception as e:
-                import sys
-
+            except BaseException as e:
+                # BaseException so pytest.skip/fail outcomes are re-raised by wait()
                 result.error = e
                 # Capture original traceback, but skip the run_test wrapper frame
-                tb = sys.exc_info()[2]
+                tb = e.__traceback__
                 if tb is not None:
                     tb = tb.tb_next  # Skip run_test frame to show only test code
                 result.error_tb = tb
                 result.passed = False
             finally:
-                # Clear thread-local redirects
-                _thread_local.stdout_redirect = None
-                _thread_local.stderr_redirect = None
+                # Push out any partial lines, then clear thread-local redirects
+                result.stdout_writer.flush()
+                result.stderr_writer.flush()
+                _stdout_redirect.set(None)
+                _stderr_redirect.set(None)
                 result.done.set()
+                result.output_queue.put((_DONE, None))
 
-        result.future = self.executor.submit(run_test)
+        # Single dict operations are atomic, so results needs no lock
+        self.results[name] = result
 
-        with self.lock:
-            self.results[name] = result
+        _install_streams()
+        self._start_workers()
+        self.tasks.put(run_test)
 
     def wait(self, name: str) -> _TestResult:
         """Wait for a dispatched test, streaming output as it arrives."""
         __tracebackhide__ = True  # Hide this frame from pytest traceback
-        with self.lock:
-            result = self.results.get(name)
+        # Remove the entry so its queue, fixture values and traceback frames are
+        # released once the caller is done with the result
+        result = self.results.pop(name, None)
 
         if result is None:
-            raise RuntimeError(f"Test '{name}' was not dispatched")
-
-        # Print from queue until done and queue is empty
-        while not (result.done.is_set() and result.output_queue.empty()):
+            raise RuntimeError(f"Test '{name}' was not dispatched or was already waited on")
+
+        # Print from queue until the worker signals completion. Flushing is
+        # deferred until the queue is drained (or the stream changes, to keep
+        # stdout/stderr ordering), so a burst of lines costs one flush.
+        output_queue = result.output_queue
+        last_stream = None
+        stream_name, text = output_queue.get()
+        while stream_name is not _DONE:
+            stream = _original_stdout if stream_name == "stdout" else _original_stderr
+            if last_stream is not None and last_stream is not stream:
+                last_stream.flush()
+            stream.write(text)
+            last_stream = stream
             try:
-                stream_name, text = result.output_queue.get(timeout=0.1)
-                if stream_name == "stdout":
-                    _original_stdout.write(text)
-                    _original_stdout.flush()
-                else:
-                    _original_stderr.write(text)
-                    _original_stderr.flush()
+                stream_name, text = output_queue.get_nowait()
             except queue.Empty:
-                continue
+                # Drained for now: flush, then block until the worker writes more
+                stream.flush()
+                stream_name, text = output_queue.get()
+        if last_stream is not None:
+            last_stream.flush()
 
-        # Ensure future is complete
-        result.future.result()
+        # The sentinel is queued after done is set, so this returns immediately
+        result.done.wait()
 
         # Re-raise with original traceback (shows only the test's stack trace)
         if not result.passed:
@@ -185,14 +298,22 @@ class ConcurrentTestRunner:
         return result
 
     def shutdown(self):
-        self.executor.shutdown(wait=True)
+        # Give later dispatches a fresh queue so they can't consume our sentinels
+        with self.lock:
+            tasks, self.tasks = self.tasks, queue.SimpleQueue()
+            workers, self.workers = self.workers, []
+        for _ in workers:
+            tasks.put(None)
+        for worker in workers:
+            worker.join()
+        _uninstall_streams()
 
 
-# Global runner
-_runner = ConcurrentTestRunner(max_workers=4)
+# Global runner (worker threads are started lazily on first dispatch)
+_runner = ConcurrentTestRunner()
 
-# Registry for concurrent tests
-_concurrent_tests: dict[str, tuple[Callable, list[str]]] = {}
+# Registry for concurrent tests, keyed by defining module then test name
+_concurrent_tests: dict[str, dict[str, tuple[Callable, list[str]]]] = {}
 
 # Registry for concurrent function fixtures (stores raw generator functions)
 _concurrent_function_fixtures: dict[str, Callable] = {}
@@ -233,36 +354,37 @@ def concurrent_test(func: Callable) -> Callable:
             pass
     """
     name = func.__name__
-    # Get the fixture names from the function signature
-    sig = inspect.signature(func)
-    fixture_names = list(sig.parameters.keys())
-    _concurrent_tests[name] = (func, fixture_names)
+    code = func.__code__
+    if hasattr(func, "__wrapped__") or code.co_flags & (
+        inspect.CO_VARARGS | inspect.CO_VARKEYWORDS
+    ):
+        # Decorated (functools.wraps) or *args/**kwargs wrappers: only the
+        # signature (which follows __wrapped__) knows the real parameters
+        fixture_names = list(inspect.signature(func).parameters)
+    else:
+        # Read the fixture names straight from the code object (much cheaper than
+        # inspect.signature); keyword-only parameters follow the positional ones
+        fixture_names = list(code.co_varnames[: code.co_argcount + code.co_kwonlyargcount])
+    _concurrent_tests.setdefault(func.__module__, {})[name] = (func, fixture_names)
     return func
 
 
+def _fixture_signature(names: list[str]) -> inspect.Signature:
+    """Build a signature whose parameters tell pytest which fixtures to request."""
+    return inspect.Signature(
+        [inspect.Parameter(n, inspect.Parameter.POSITIONAL_OR_KEYWORD) for n in names]
+    )
+
+
 def make_dispatch_test(name: str, func: Callable, fixture_names: list[str]):
     """Create a dispatch test method that resolves fixtures and dispatches."""
 
-    # Build the function signature dynamically to request fixtures
-    if fixture_names:
-        # Create a dispatch function that takes fixtures as parameters
-        params = ", ".join(fixture_names)
-        func_args = ", ".join(f"{f}={f}" for f in fixture_names)
-
-        # Use exec to create a function with the right signature
-        # This is necessary for pytest to detect fixture parameters
-        code = f"""
-def test_dispatch(self, {params}):
-    _runner.dispatch(name, func, {func_args})
-"""
-        local_vars = {"_runner": _runner, "name": name, "func": func}
-        exec(code, local_vars)
-        test_dispatch = local_vars["test_dispatch"]
-    else:
-
-        def test_dispatch(self):
-            _runner.dispatch(name, func)
+    def test_dispatch(self, **fixtures):
+        _runner.dispatch(name, func, **fixtures)
 
+    # pytest reads fixture parameters from __signature__, so the closure can
+    # accept them as keyword arguments
+    test_dispatch.__signature__ = _fixture_signature(["self", *fixture_names])
     test_dispatch.__name__ = f"test_dispatch_{name}"
     test_dispatch.__qualname__ = f"TestDispatch.test_dispatch_{name}"
     return test_dispatch
@@ -275,65 +397,31 @@ def make_dispatch_fixture(name: str, func: Callable, fixture_names: list[str]):
     to bypass pytest's scope checking. This allows function-scoped fixtures to work
     with module-scoped dispatch fixtures.
     """
+    # Concurrent function fixtures are invoked manually; everything else is
+    # requested from pytest normally (must be module+ scoped)
+    manual_names = [f for f in fixture_names if f in _concurrent_function_fixtures]
+    pytest_fixture_names = [f for f in fixture_names if f not in _concurrent_function_fixtures]
+
+    def dispatch_fixture(**fixtures):
+        generators = []
+        for fname in manual_names:
+            gen = _concurrent_function_fixtures[fname]()
+            generators.append(gen)
+            fixtures[fname] = next(gen)
+
+        _runner.dispatch(name, func, **fixtures)
+        yield name
+
+        for gen in generators:
+            try:
+                next(gen)
+            except StopIteration:
+                pass
 
-    if fixture_names:
-        # Build code that manually invokes concurrent function fixtures
-        # and passes their values to the test function
-        setup_lines = []
-        cleanup_lines = []
-        func_args_parts = []
-        pytest_fixture_names = []
-
-        for fname in fixture_names:
-            if fname in _concurrent_function_fixtures:
-                # Manually invoke the fixture generator
-                setup_lines.append(
-                    f"    _gen_{fname} = _concurrent_function_fixtures['{fname}']()\n"
-                    f"    {fname} = next(_gen_{fname})"
-                )
-                cleanup_lines.append(
-                    f"    try:\n        next(_gen_{fname})\n    except StopIteration:\n        pass"
-                )
-            else:
-                # Request from pytest normally (must be module+ scoped)
-                pytest_fixture_names.append(fname)
-            func_args_parts.append(f"{fname}={fname}")
-
-        params = ", ".join(pytest_fixture_names)
-        func_args = ", ".join(func_args_parts)
-        setup_code = (
-            "\n".join(setup_lines) if setup_lines else "    pass  # no manual fixture setup"
-        )
-        cleanup_code = (
-            "\n".join(cleanup_lines) if cleanup_lines else "    pass  # no manual fixture cleanup"
-        )
-
-        code = f"""
-@pytest.fixture(scope="module")
-def dispatch_{name}({params}):
-{setup_code}
-    _runner.dispatch('{name}', func, {func_args})
-    yield '{name}'
-{cleanup_code}
-"""
-        local_vars = {
-            "_runner": _runner,
-            "func": func,
-            "pytest": pytest,
-            "_concurrent_function_fixtures": _concurrent_function_fixtures,
-        }
-        exec(code, local_vars)
-        dispatch_fixture = local_vars[f"dispatch_{name}"]
-    else:
-
-        @pytest.fixture(scope="module")
-        def dispatch_fixture():
-            _runner.dispatch(name, func)
-            yield name
-
-        dispatch_fixture.__name__ = f"dispatch_{name}"
-
-    return dispatch_fixture
+    dispatch_fixture.__signature__ = _fixture_signature(pytest_fixture_names)
+    dispatch_fixture.__name__ = f"dispatch_{name}"
+    dispatch_fixture.__qualname__ = f"dispatch_{name}"
+    return pytest.fixture(scope="module")(dispatch_fixture)
 
 
 def make_wait_func(name: str):
@@ -342,17 +430,37 @@ def make_wait_func(name: str):
     # Avoid doubling the test_ prefix if name already starts with test_
     test_name = name if name.startswith("test_") else f"test_{name}"
 
-    code = f"""
-def {test_name}(dispatch_{name}):
-    __tracebackhide__ = True
-    _runner.wait(name)
-"""
-    local_vars = {"_runner": _runner, "name": name}
-    exec(code, local_vars)
-    test_func = local_vars[test_name]
+    def test_func(**dispatch_fixture):
+        __tracebackhide__ = True
+        _runner.wait(name)
+
+    test_func.__signature__ = _fixture_signature([f"dispatch_{name}"])
+    test_func.__name__ = test_name
+    test_func.__qualname__ = test_name
     return test_func
 
 
+def _module_tests(module_globals: dict) -> dict[str, tuple[Callable, list[str]]]:
+    """Collect the concurrent tests defined in, or imported into, a module.
+
+    Tests from another module are included when the module itself was imported
+    (``import helpers``) or when the test functions were (``from helpers import
+    my_test``). On a name clash the module's own test wins.
+    """
+    tests = {}
+    for value in list(module_globals.values()):
+        if inspect.ismodule(value):
+            tests.update(_concurrent_tests.get(value.__name__, {}))
+            continue
+        registered = _concurrent_tests.get(getattr(value, "__module__", None), {})
+        entry = registered.get(getattr(value, "__name__", None))
+        if entry is not None and entry[0] is value:
+            tests[value.__name__] = entry
+    # Apply the module's own tests last so imported ones can't replace them
+    tests.update(_concurrent_tests.get(module_globals.get("__name__"), {}))
+    return tests
+
+
 def generate_tests(module_globals: dict) -> None:
     """
     Generate test functions and inject them into the module namespace.
@@ -366,10 +474,14 @@ def generate_tests(module_globals: dict) -> None:
         - test_all: Test that triggers all dispatch fixtures (ensures concurrency)
         - test_<name>: Waits for and streams the result of each test
 
+    Only @concurrent_test functions defined in this module, or imported into it
+    (see _module_tests), are generated; tests in other test modules are not.
+
     NOTE: Fixtures used by @concurrent_test functions should be session or module
     scoped to ensure they stay alive during test execution.
     """
-    if not _concurrent_tests:
+    module_tests = _module_tests(module_globals)
+    if not module_tests:
         return
 
     # Add cleanup fixture
@@ -377,7 +489,7 @@ def generate_tests(module_globals: dict) -> None:
 
         @pytest.fixture(scope="session", autouse=True)
         def _cleanup_parallel_runner():
-            """Cleanup fixture to shutdown the executor after all tests."""
+            """Cleanup fixture to shut down the worker threads after all tests."""
             yield
             _runner.shutdown()
 
@@ -385,32 +497,20 @@ def generate_tests(module_globals: dict) -> None:
 
     # Add dispatch fixtures
     dispatch_fixture_names = []
-    for name, (func, fixture_names) in _concurrent_tests.items():
+    for name, (func, fixture_names) in module_tests.items():
         fixture_name = f"dispatch_{name}"
         dispatch_fixture_names.append(fixture_name)
         module_globals[fixture_name] = make_dispatch_fixture(name, func, fixture_names)
 
     # Add test_all that depends on all dispatch fixtures (triggers concurrent dispatch)
-    params = ", ".join(dispatch_fixture_names)
-    code = f"""
-def test_all({params}):
-    '''Triggers all dispatch fixtures to start concurrent execution.'''
-    pass
-"""
-    exec(code, {})
-    module_globals["test_all"] = eval(f"lambda {params}: None")
-    module_globals["test_all"].__name__ = "test_all"
+    def test_all(**dispatched):
+        """Triggers all dispatch fixtures to start concurrent execution."""
+
+    test_all.__signature__ = _fixture_signature(dispatch_fixture_names)
+    module_globals["test_all"] = test_all
 
     # Add wait tests
-    for name in _concurrent_tests:
+    for name in module_tests:
         # Avoid doubling the test_ prefix
         test_name = name if name.startswith("test_") else f"test_{name}"
         module_globals[test_name] = make_wait_func(name)
-
-
-# Keep module-level fixture as fallback for imports
-@pytest.fixture(scope="session", autouse=True)
-def cleanup_runner():
-    """Cleanup fixture to shutdown the executor after all tests."""
-    yield
-    _runner.shutdown()
@@ -8,87 +8,396 @@ These tests run pytest as a subprocess and inspect the output to verify:
 5. Fixtures work correctly
 """
 
+import atexit
+import codecs
+import hashlib
+import json
 import os
+import select
+import selectors
+import shutil
 import subprocess
 import sys
 import tempfile
 import textwrap
 import time
 from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
 
 # Get the project root to ensure pytest-threaded is importable
 PROJECT_ROOT = Path(__file__).parent.parent
 
-
-def run_pytest(test_code: str, *args, timeout: int = 30) -> subprocess.CompletedProcess:
+# Generated test files are named by content, so a snippet used by several tests
+# (e.g. OUTPUT_APPEARS_SRC) is written once and pytest's rewritten .pyc is reused.
+# One directory per process keeps parallel test runs from racing on the same files.
+CACHE_DIR = Path(tempfile.mkdtemp(prefix="pytest_threaded_"))
+atexit.register(shutil.rmtree, CACHE_DIR, ignore_errors=True)
+
+# Options for every child pytest run. The tests only look at printed markers,
+# the summary line and the JUnit XML report, so skip the plugins and output
+# they do not need. -s keeps test output visible to the assertions.
+PYTEST_ARGS = [
+    "-s",
+    "--no-header",
+    "-p",
+    "no:cacheprovider",
+    "-p",
+    "no:stepwise",
+    "-p",
+    "no:warnings",
+]
+
+# Source for a long-lived helper process. It pays for interpreter startup and
+# the pytest import once, then forks a fresh child per request so every run
+# still starts from clean module state (pytest-threaded keeps global registries).
+# Requests and replies are single JSON lines on stdin/stdout.
+WORKER_SRC = textwrap.dedent(
     """
-    Run pytest on the given test code in a subprocess.
+    import json
+    import os
+    import signal
+    import sys
+    import tempfile
+
+    import pytest
+    import pytest_threaded.plugin
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                signal.alarm(request["timeout"])
+                os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+                os.dup2(out.fileno(), 1)
+                os.dup2(err.fileno(), 2)
+                try:
+                    code = int(pytest.main(request["args"]))
+                except BaseException:
+                    code = 1
+                sys.__stdout__.flush()
+                sys.__stderr__.flush()
+                os._exit(code)
+
+            _, status = os.waitpid(pid, 0)
+            out.seek(0)
+            err.seek(0)
+            reply = {
+                "returncode": os.waitstatus_to_exitcode(status),
+                "timed_out": os.WIFSIGNALED(status) and os.WTERMSIG(status) == signal.SIGALRM,
+                "stdout": out.read().decode(errors="replace"),
+                "stderr": err.read().decode(errors="replace"),
+            }
+        sys.stdout.write(json.dumps(reply) + "\\n")
+        sys.stdout.flush()
+    """
+)
 
-    Creates a temporary file with the test code and runs pytest on it.
-    Captures output for test assertions and prints it to host terminal.
+
+def write_test_file(test_code: str) -> Path:
+    """Write test code to its content-addressed file in CACHE_DIR, if not already there."""
+    digest = hashlib.blake2b(test_code.encode(), digest_size=16).hexdigest()
+    path = CACHE_DIR / f"test_{digest}.py"
+    if not path.exists():
+        path.write_text(test_code)
+    return path
+
+
+def pytest_env() -> dict[str, str]:
+    """Environment for child pytest processes, with our package importable."""
+    env = os.environ.copy()
+    pythonpath = str(PROJECT_ROOT / "src")
+    if "PYTHONPATH" in env:
+        env["PYTHONPATH"] = f"{pythonpath}:{env['PYTHONPATH']}"
+    else:
+        env["PYTHONPATH"] = pythonpath
+    return env
+
+
+def wait_for_exit(process: subprocess.Popen, timeout: float) -> int:
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", prefix="test_", delete=False) as f:
-        f.write(test_code)
-        f.flush()
-        test_file = f.name
+    Wait for a process to exit and return its exit code.
 
+    Where pidfds are available (Linux) the kernel wakes us when the child exits,
+    instead of Popen.wait(timeout) sleeping and re-checking in a loop. Like
+    subprocess.run, the child is killed if it is still running at the timeout.
+    """
     try:
-        env = os.environ.copy()
-        # Ensure our package is importable
-        pythonpath = str(PROJECT_ROOT / "src")
-        if "PYTHONPATH" in env:
-            env["PYTHONPATH"] = f"{pythonpath}:{env['PYTHONPATH']}"
-        else:
-            env["PYTHONPATH"] = pythonpath
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        try:
+            return process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        if not poller.poll(timeout * 1000):
+            process.kill()
+            process.wait()
+            raise subprocess.TimeoutExpired(process.args, timeout)
+    finally:
+        os.close(pidfd)
+    return process.wait()
+
 
-        result = subprocess.run(
-            [sys.executable, "-m", "pytest", test_file, "-v", "-s", *args],
-            capture_output=True,
+def run_subprocess(
+    cmd: list[str], timeout: float, echo: bool = False, **kwargs
+) -> subprocess.CompletedProcess:
+    """
+    Run a command, capturing stdout/stderr, like subprocess.run(capture_output=True).
+
+    Both pipes are drained as data arrives (so a chatty child can't block on a
+    full pipe), optionally echoing each chunk to our own stdout/stderr straight
+    away, and the exit is then awaited with wait_for_exit.
+    """
+    deadline = time.monotonic() + timeout
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs) as process:
+        # pipe -> (incremental decoder, decoded chunks, host stream to echo to)
+        streams = {
+            process.stdout: (codecs.getincrementaldecoder("utf-8")("replace"), [], sys.stdout),
+            process.stderr: (codecs.getincrementaldecoder("utf-8")("replace"), [], sys.stderr),
+        }
+        with selectors.DefaultSelector() as selector:
+            for pipe in streams:
+                selector.register(pipe, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                events = selector.select(remaining) if remaining > 0 else []
+                if not events:
+                    process.kill()
+                    raise subprocess.TimeoutExpired(
+                        cmd,
+                        timeout,
+                        "".join(streams[process.stdout][1]),
+                        "".join(streams[process.stderr][1]),
+                    )
+                for key, _ in events:
+                    decoder, chunks, host_stream = streams[key.fileobj]
+                    data = os.read(key.fd, 65536)
+                    text = decoder.decode(data, final=not data)
+                    if text:
+                        chunks.append(text)
+                        if echo:
+                            host_stream.write(text)
+                            host_stream.flush()
+                    if not data:
+                        selector.unregister(key.fileobj)
+        try:
+            returncode = wait_for_exit(process, max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            # Report the caller's timeout, not what was left of it
+            raise subprocess.TimeoutExpired(
+                cmd,
+                timeout,
+                "".join(streams[process.stdout][1]),
+                "".join(streams[process.stderr][1]),
+            ) from None
+    return subprocess.CompletedProcess(
+        cmd,
+        returncode,
+        "".join(streams[process.stdout][1]),
+        "".join(streams[process.stderr][1]),
+    )
+
+
+class PytestWorker:
+    """Client for the WORKER_SRC helper process."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", WORKER_SRC],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
             text=True,
-            timeout=timeout,
-            env=env,
+            env=pytest_env(),
             cwd=str(PROJECT_ROOT),
         )
-        # Print captured output to host
-        if result.stdout:
-            sys.stdout.write(result.stdout)
-            sys.stdout.flush()
-        if result.stderr:
-            sys.stderr.write(result.stderr)
-            sys.stderr.flush()
-        return result
-    finally:
-        os.unlink(test_file)
 
+    def run(self, args: list[str], timeout: int) -> subprocess.CompletedProcess:
+        """Run pytest with the given arguments in a freshly forked child."""
+        self.process.stdin.write(json.dumps({"args": args, "timeout": timeout}) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError("pytest worker process exited unexpectedly")
+        reply = json.loads(line)
+        if reply["timed_out"]:
+            raise subprocess.TimeoutExpired(args, timeout, reply["stdout"], reply["stderr"])
+        return subprocess.CompletedProcess(
+            args, reply["returncode"], reply["stdout"], reply["stderr"]
+        )
 
-class TestParallelExecution:
-    """Verify that tests actually run in parallel."""
+    def close(self):
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process.wait()
 
-    def test_parallel_timing(self):
-        """Three 1-second tests should complete in ~1s, not ~3s."""
-        test_code = textwrap.dedent(
-            """
-            import time
-            from pytest_threaded import concurrent_test, generate_tests
 
-            @concurrent_test
-            def slow_a():
-                time.sleep(1)
+_worker: PytestWorker | None = None
+
 
-            @concurrent_test
-            def slow_b():
-                time.sleep(1)
+@pytest.fixture(scope="module", autouse=True)
+def pytest_worker():
+    """Route run_pytest through one helper process per module (POSIX only)."""
+    global _worker
+    if not hasattr(os, "fork"):
+        yield None
+        return
+    _worker = PytestWorker()
+    yield _worker
+    _worker.close()
+    _worker = None
 
-            @concurrent_test
-            def slow_c():
-                time.sleep(1)
 
-            generate_tests(globals())
-        """
+def run_pytest(
+    test_code: str, *args, timeout: int = 30, use_worker: bool = True
+) -> subprocess.CompletedProcess:
+    """
+    Run pytest on the given test code in a subprocess.
+
+    Writes the test code to a file and runs pytest on it, in a child of the
+    shared helper process when available, otherwise in a fresh interpreter.
+    Captures output for test assertions and prints it to host terminal.
+    """
+    return run_pytest_files(
+        [write_test_file(test_code)], *args, timeout=timeout, use_worker=use_worker
+    )
+
+
+def run_pytest_files(
+    test_files: list[Path], *args, timeout: int = 30, use_worker: bool = True
+) -> subprocess.CompletedProcess:
+    """Run a single pytest invocation over the given test files (see run_pytest)."""
+    pytest_args = [*map(str, test_files), *PYTEST_ARGS, *args]
+    if not use_worker or _worker is None:
+        # Output is echoed to the host as it arrives
+        return run_subprocess(
+            [sys.executable, "-m", "pytest", *pytest_args],
+            timeout,
+            echo=True,
+            env=pytest_env(),
+            cwd=str(PROJECT_ROOT),
         )
 
+    result = _worker.run(pytest_args, timeout)
+    # Print captured output to host
+    if result.stdout:
+        sys.stdout.write(result.stdout)
+        sys.stdout.flush()
+    if result.stderr:
+        sys.stderr.write(result.stderr)
+        sys.stderr.flush()
+    return result
+
+
+def run_pytest_batch(
+    snippets: list[str], *args, timeout: int = 30
+) -> tuple[subprocess.CompletedProcess, list[dict[str, str]]]:
+    """
+    Run several snippets in one pytest invocation and split the results per snippet.
+
+    Returns the combined result and, for each snippet in order, a mapping of
+    test name to outcome ("passed", "failed", "skipped" or "error") taken from
+    a JUnit XML report.
+    """
+    test_files = [write_test_file(code) for code in snippets]
+    report = CACHE_DIR / f"report_{'_'.join(path.stem for path in test_files)}.xml"
+    result = run_pytest_files(test_files, f"--junitxml={report}", *args, timeout=timeout)
+
+    outcomes: dict[str, dict[str, str]] = {path.stem: {} for path in test_files}
+    for case in ElementTree.parse(report).iter("testcase"):
+        if case.find("failure") is not None:
+            outcome = "failed"
+        elif case.find("error") is not None:
+            outcome = "error"
+        elif case.find("skipped") is not None:
+            outcome = "skipped"
+        else:
+            outcome = "passed"
+        outcomes[case.get("classname")][case.get("name")] = outcome
+    return result, [outcomes[path.stem] for path in test_files]
+
+
+PARALLEL_TIMING_SRC = textwrap.dedent(
+    """
+    import time
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def slow_a():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_b():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_c():
+        time.sleep(1)
+
+    generate_tests(globals())
+    """
+)
+
+
+PARALLEL_TIMING_MORE_THAN_FOUR_SRC = textwrap.dedent(
+    """
+    import time
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def slow_a():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_b():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_c():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_d():
+        time.sleep(1)
+
+    @concurrent_test
+    def slow_e():
+        time.sleep(1)
+
+    generate_tests(globals())
+    """
+)
+
+
+PIN_WORKERS_SRC = textwrap.dedent(
+    """
+    import os
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def pinned():
+        print(f"AFFINITY:{len(os.sched_getaffinity(0))}")
+
+    generate_tests(globals())
+    """
+)
+
+
+class TestParallelExecution:
+    """Verify that tests actually run in parallel."""
+
+    def test_parallel_timing(self):
+        """Three 1-second tests should complete in ~1s, not ~3s."""
         start = time.time()
-        result = run_pytest(test_code)
+        result = run_pytest(PARALLEL_TIMING_SRC)
         elapsed = time.time() - start
 
         # Should complete in ~1-2s if parallel, ~3s+ if sequential
@@ -98,89 +407,189 @@ class TestParallelExecution:
         output = result.stdout + result.stderr
         assert "4 passed" in output or "passed" in output
 
+    def test_parallel_timing_more_than_four(self):
+        """Five 1-second tests should not be serialised by a fixed-size pool."""
+        start = time.time()
+        result = run_pytest(PARALLEL_TIMING_MORE_THAN_FOUR_SRC)
+        elapsed = time.time() - start
 
-class TestIndividualPassFail:
-    """Verify each test reports its own pass/fail status."""
+        # A pool of four workers would need two rounds (~2s+)
+        assert elapsed < 1.9, f"Tests took {elapsed:.2f}s - expected <1.9s for parallel execution"
+        assert result.returncode == 0, "Tests failed"
 
-    def test_mixed_pass_fail(self):
-        """One passing, one failing test should show individual results."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
+    @pytest.mark.skipif(
+        not hasattr(os, "sched_setaffinity") or len(os.sched_getaffinity(0)) < 2,
+        reason="needs Linux and at least 2 CPUs (a 1-CPU affinity proves nothing)",
+    )
+    def test_pin_workers(self):
+        """With threaded_pin_workers set, each worker should be bound to a single CPU."""
+        result = run_pytest(PIN_WORKERS_SRC, "-o", "threaded_pin_workers=true")
+        assert result.returncode == 0, "Tests failed"
+        assert "AFFINITY:1" in result.stdout
 
-            @concurrent_test
-            def passing():
-                assert True
 
-            @concurrent_test
-            def failing():
-                assert False, "intentional failure"
+MIXED_PASS_FAIL_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
 
-            generate_tests(globals())
-        """
-        )
+    @concurrent_test
+    def passing():
+        assert True
 
-        result = run_pytest(test_code)
+    @concurrent_test
+    def failing():
+        assert False, "intentional failure"
 
-        # Should have exit code 1 (some failures)
-        assert result.returncode == 1
+    generate_tests(globals())
+    """
+)
 
-        output = result.stdout + result.stderr
 
-        # Should show individual pass/fail
-        assert "PASSED" in output, "No PASSED in output"
-        assert "FAILED" in output, "No FAILED in output"
+ALL_PASSING_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
 
-        # Should show 2 passed (test_all + passing), 1 failed
-        assert "2 passed" in output
-        assert "1 failed" in output
+    @concurrent_test
+    def test_a():
+        assert True
 
-    def test_all_passing(self):
-        """All tests pass - should exit 0."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
+    @concurrent_test
+    def test_b():
+        assert 1 + 1 == 2
 
-            @concurrent_test
-            def test_a():
-                assert True
+    generate_tests(globals())
+    """
+)
 
-            @concurrent_test
-            def test_b():
-                assert 1 + 1 == 2
 
-            generate_tests(globals())
-        """
-        )
+ALL_FAILING_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
 
-        result = run_pytest(test_code)
-        assert result.returncode == 0
-        output = result.stdout + result.stderr
-        # 2 parallel tests + test_all = at least 3 passed, may also generate test_test_a etc
-        assert "passed" in output
+    @concurrent_test
+    def fail_a():
+        assert False, "fail a"
 
-    def test_all_failing(self):
-        """All tests fail - should exit 1 with all failures reported."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
+    @concurrent_test
+    def fail_b():
+        assert False, "fail b"
 
-            @concurrent_test
-            def fail_a():
-                assert False, "fail a"
+    generate_tests(globals())
+    """
+)
 
-            @concurrent_test
-            def fail_b():
-                assert False, "fail b"
 
-            generate_tests(globals())
-        """
-        )
+PYTEST_OUTCOMES_SRC = textwrap.dedent(
+    """
+    import pytest
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def skipped():
+        pytest.skip("skip reason")
+
+    @concurrent_test
+    def explicitly_failed():
+        pytest.fail("fail reason")
+
+    generate_tests(globals())
+    """
+)
 
-        result = run_pytest(test_code)
+
+@pytest.fixture(scope="module")
+def pass_fail_batch():
+    """Run the snippets with failures in a single pytest invocation."""
+    return run_pytest_batch([MIXED_PASS_FAIL_SRC, ALL_FAILING_SRC, PYTEST_OUTCOMES_SRC], "-rs")
+
+
+class TestIndividualPassFail:
+    """Verify each test reports its own pass/fail status."""
+
+    def test_mixed_pass_fail(self, pass_fail_batch):
+        """One passing, one failing test should show individual results."""
+        result, outcomes = pass_fail_batch
+
+        # Some failures in the batch, so exit code 1
         assert result.returncode == 1
+
+        # test_all + passing pass, failing fails
+        assert outcomes[0] == {
+            "test_all": "passed",
+            "test_passing": "passed",
+            "test_failing": "failed",
+        }
+
+    def test_all_passing(self):
+        """All tests pass - should exit 0."""
+        # Run on its own so the exit code is this module's alone
+        result, outcomes = run_pytest_batch([ALL_PASSING_SRC])
+        assert result.returncode == 0
+        # 2 parallel tests + test_all, without doubling the test_ prefix
+        assert outcomes[0] == {"test_all": "passed", "test_a": "passed", "test_b": "passed"}
+
+    def test_all_failing(self, pass_fail_batch):
+        """All tests fail - all failures should be reported."""
+        _, outcomes = pass_fail_batch
+        assert outcomes[1] == {
+            "test_all": "passed",
+            "test_fail_a": "failed",
+            "test_fail_b": "failed",
+        }
+
+    def test_pytest_outcomes(self, pass_fail_batch):
+        """pytest.skip and pytest.fail inside a concurrent test should be reported as such."""
+        result, outcomes = pass_fail_batch
+        assert outcomes[2] == {
+            "test_all": "passed",
+            "test_skipped": "skipped",
+            "test_explicitly_failed": "failed",
+        }
         output = result.stdout + result.stderr
-        assert "2 failed" in output
+        assert "skip reason" in output
+        assert "fail reason" in output
+
+
+OUTPUT_NOT_INTERLEAVED_SRC = textwrap.dedent(
+    """
+    import time
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def alpha():
+        for i in range(5):
+            print(f"ALPHA:{i}")
+            time.sleep(0.05)
+
+    @concurrent_test
+    def beta():
+        for i in range(5):
+            print(f"BETA:{i}")
+            time.sleep(0.05)
+
+    generate_tests(globals())
+    """
+)
+
+
+REDIRECTED_STREAM_IS_NOT_A_TERMINAL_SRC = textwrap.dedent(
+    """
+    import io
+    import sys
+    import pytest
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def stream_properties():
+        assert sys.stdout.isatty() is False
+        assert sys.stdout.encoding == "utf-8"
+        with pytest.raises(io.UnsupportedOperation):
+            sys.stdout.fileno()
+        print("STREAM_CHECKS_DONE")
+
+    generate_tests(globals())
+    """
+)
 
 
 class TestThreadIsolatedOutput:
@@ -188,41 +597,130 @@ class TestThreadIsolatedOutput:
 
     def test_output_not_interleaved(self):
         """Each test's output should appear as a contiguous block, not interleaved."""
-        test_code = textwrap.dedent(
-            """
-            import time
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def alpha():
-                for i in range(5):
-                    print(f"ALPHA:{i}")
-                    time.sleep(0.05)
-
-            @concurrent_test
-            def beta():
-                for i in range(5):
-                    print(f"BETA:{i}")
-                    time.sleep(0.05)
-
-            generate_tests(globals())
-        """
+        result = run_pytest(OUTPUT_NOT_INTERLEAVED_SRC)
+        assert result.returncode == 0, "Tests failed"
+
+        output = result.stdout
+
+        # ALPHA should print before BETA (test order is alphabetical),
+        # so no ALPHA line may come after the first BETA line
+        last_alpha = output.rfind("ALPHA:")
+        first_beta = output.find("BETA:")
+        assert last_alpha == -1 or first_beta == -1 or last_alpha < first_beta, (
+            "Output is interleaved! Saw ALPHA after BETA"
         )
 
-        result = run_pytest(test_code)
+    def test_redirected_stream_is_not_a_terminal(self):
+        """Inside a concurrent test, sys.stdout should behave like an in-memory stream."""
+        result = run_pytest(REDIRECTED_STREAM_IS_NOT_A_TERMINAL_SRC)
         assert result.returncode == 0, "Tests failed"
+        assert "STREAM_CHECKS_DONE" in result.stdout
+
+
+IMPORT_LEAVES_STREAMS_SRC = textwrap.dedent(
+    """
+    import sys
+
+    import pytest_threaded
+    import pytest_threaded.runner
+
+    print(f"STDOUT_TYPE:{type(sys.stdout).__name__}")
+    print(f"STDERR_TYPE:{type(sys.stderr).__name__}")
+    """
+)
+
+
+SESSION_RESTORES_STREAMS_SRC = textwrap.dedent(
+    """
+    import sys
+
+    import pytest
+
+    stdout, stderr = sys.stdout, sys.stderr
+    code = pytest.main(sys.argv[1:])
+    print(f"RESTORED:{sys.stdout is stdout and sys.stderr is stderr}")
+    sys.exit(code)
+    """
+)
+
+
+PLAIN_TEST_SRC = textwrap.dedent(
+    """
+    def test_plain():
+        print("PLAIN_RAN")
+    """
+)
 
-        output = result.stdout
 
-        # State machine: ALPHA should print before BETA (test order is alphabetical)
-        # Once we see BETA, we should never see ALPHA again
-        seen_beta = False
+class TestStreamInstallation:
+    """Verify when the thread-local streams replace sys.stdout/sys.stderr."""
 
-        for line in output.split("\n"):
-            if "ALPHA:" in line:
-                assert not seen_beta, "Output is interleaved! Saw ALPHA after BETA"
-            elif "BETA:" in line:
-                seen_beta = True
+    def test_import_leaves_streams(self):
+        """Importing the package outside pytest should not replace the process streams."""
+        result = run_subprocess(
+            [sys.executable, "-c", IMPORT_LEAVES_STREAMS_SRC], timeout=30, env=pytest_env()
+        )
+        assert result.returncode == 0, result.stderr
+        assert "STDOUT_TYPE:ThreadLocalStream" not in result.stdout
+        assert "STDERR_TYPE:ThreadLocalStream" not in result.stdout
+
+    @pytest.mark.parametrize("capture", ["-s", "default"])
+    @pytest.mark.parametrize("kind", ["concurrent", "plain"])
+    def test_session_restores_streams(self, capture, kind):
+        """After a session, with or without capture or any dispatch, the real streams are back."""
+        test_file = write_test_file(OUTPUT_APPEARS_SRC if kind == "concurrent" else PLAIN_TEST_SRC)
+        args = PYTEST_ARGS if capture == "-s" else [a for a in PYTEST_ARGS if a != "-s"]
+        result = run_subprocess(
+            [sys.executable, "-c", SESSION_RESTORES_STREAMS_SRC, str(test_file), *args],
+            timeout=30,
+            env=pytest_env(),
+            cwd=str(PROJECT_ROOT),
+        )
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "RESTORED:True" in result.stdout
+
+
+TRACEBACK_SHOWS_TEST_CODE_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def my_failing_test():
+        x = 1
+        y = 2
+        assert x == y, "x should equal y"
+
+    generate_tests(globals())
+    """
+)
+
+
+EXCEPTION_TRACEBACK_SHOWS_ORIGIN_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def exception_test():
+        def inner_func():
+            raise ValueError("error from inner_func")
+        inner_func()
+
+    generate_tests(globals())
+    """
+)
+
+
+TRACEBACK_EXCLUDES_RUNNER_INTERNALS_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def simple_failure():
+        raise RuntimeError("simple error")
+
+    generate_tests(globals())
+    """
+)
 
 
 class TestCleanTracebacks:
@@ -230,21 +728,7 @@ class TestCleanTracebacks:
 
     def test_traceback_shows_test_code(self):
         """Traceback should include the test function, not just runner internals."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def my_failing_test():
-                x = 1
-                y = 2
-                assert x == y, "x should equal y"
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(TRACEBACK_SHOWS_TEST_CODE_SRC)
         assert result.returncode == 1
 
         output = result.stdout + result.stderr
@@ -259,21 +743,7 @@ class TestCleanTracebacks:
 
     def test_exception_traceback_shows_origin(self):
         """Exception raised in test should show original location."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def exception_test():
-                def inner_func():
-                    raise ValueError("error from inner_func")
-                inner_func()
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(EXCEPTION_TRACEBACK_SHOWS_ORIGIN_SRC)
         assert result.returncode == 1
 
         output = result.stdout + result.stderr
@@ -284,19 +754,7 @@ class TestCleanTracebacks:
 
     def test_traceback_excludes_runner_internals(self):
         """Traceback should not be cluttered with runner.py internals."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def simple_failure():
-                raise RuntimeError("simple error")
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(TRACEBACK_EXCLUDES_RUNNER_INTERNALS_SRC)
         output = result.stdout + result.stderr
 
         # Count how many times runner.py appears in traceback
@@ -308,58 +766,129 @@ class TestCleanTracebacks:
         assert test_file_mentions >= 1, "Test function not in output"
 
 
+FIXTURE_VALUE_PASSED_SRC = textwrap.dedent(
+    """
+    import pytest
+    from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
+
+    @pytest.fixture(scope="function")
+    @concurrent_function_fixture
+    def my_fixture():
+        yield {"value": 42}
+
+    @concurrent_test
+    def test_uses_fixture(my_fixture):
+        print(f"FIXTURE_VALUE:{my_fixture['value']}")
+        assert my_fixture["value"] == 42
+
+    generate_tests(globals())
+    """
+)
+
+
+FIXTURE_SETUP_TEARDOWN_SRC = textwrap.dedent(
+    """
+    import pytest
+    from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
+
+    @pytest.fixture(scope="function")
+    @concurrent_function_fixture
+    def tracked_fixture():
+        print("FIXTURE:SETUP")
+        yield "resource"
+        print("FIXTURE:TEARDOWN")
+
+    @concurrent_test
+    def test_with_tracked(tracked_fixture):
+        print(f"FIXTURE:USING:{tracked_fixture}")
+        assert tracked_fixture == "resource"
+
+    generate_tests(globals())
+    """
+)
+
+
+MULTIPLE_FIXTURES_SRC = textwrap.dedent(
+    """
+    import pytest
+    from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
+
+    @pytest.fixture(scope="function")
+    @concurrent_function_fixture
+    def fixture_a():
+        yield "A"
+
+    @pytest.fixture(scope="function")
+    @concurrent_function_fixture
+    def fixture_b():
+        yield "B"
+
+    @concurrent_test
+    def test_multi(fixture_a, fixture_b):
+        print(f"VALUES:{fixture_a}:{fixture_b}")
+        assert fixture_a == "A"
+        assert fixture_b == "B"
+
+    generate_tests(globals())
+    """
+)
+
+
+NO_FIXTURES_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def no_fixture_test():
+        print("NO_FIXTURES_NEEDED")
+        assert True
+
+    generate_tests(globals())
+    """
+)
+
+
+WRAPPED_TEST_FIXTURES_SRC = textwrap.dedent(
+    """
+    import functools
+
+    import pytest
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @pytest.fixture(scope="module")
+    def res():
+        return "resource"
+
+    def logged(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            print("WRAPPER_CALLED")
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    @concurrent_test
+    @logged
+    def wrapped(res):
+        print(f"WRAPPED_GOT:{res}")
+
+    generate_tests(globals())
+    """
+)
+
+
 class TestFixtureSupport:
     """Verify that fixtures work correctly with parallel tests."""
 
     def test_fixture_value_passed(self):
         """Fixture value should be correctly passed to test."""
-        test_code = textwrap.dedent(
-            """
-            import pytest
-            from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
-
-            @pytest.fixture(scope="function")
-            @concurrent_function_fixture
-            def my_fixture():
-                yield {"value": 42}
-
-            @concurrent_test
-            def test_uses_fixture(my_fixture):
-                print(f"FIXTURE_VALUE:{my_fixture['value']}")
-                assert my_fixture["value"] == 42
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(FIXTURE_VALUE_PASSED_SRC)
         assert result.returncode == 0, "Test failed"
         assert "FIXTURE_VALUE:42" in result.stdout
 
     def test_fixture_setup_teardown(self):
         """Fixture setup and teardown should both execute."""
-        test_code = textwrap.dedent(
-            """
-            import pytest
-            from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
-
-            @pytest.fixture(scope="function")
-            @concurrent_function_fixture
-            def tracked_fixture():
-                print("FIXTURE:SETUP")
-                yield "resource"
-                print("FIXTURE:TEARDOWN")
-
-            @concurrent_test
-            def test_with_tracked(tracked_fixture):
-                print(f"FIXTURE:USING:{tracked_fixture}")
-                assert tracked_fixture == "resource"
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(FIXTURE_SETUP_TEARDOWN_SRC)
         output = result.stdout
 
         assert result.returncode == 0, "Test failed"
@@ -369,78 +898,80 @@ class TestFixtureSupport:
 
     def test_multiple_fixtures(self):
         """Test can use multiple fixtures."""
-        test_code = textwrap.dedent(
-            """
-            import pytest
-            from pytest_threaded import concurrent_test, concurrent_function_fixture, generate_tests
-
-            @pytest.fixture(scope="function")
-            @concurrent_function_fixture
-            def fixture_a():
-                yield "A"
-
-            @pytest.fixture(scope="function")
-            @concurrent_function_fixture
-            def fixture_b():
-                yield "B"
-
-            @concurrent_test
-            def test_multi(fixture_a, fixture_b):
-                print(f"VALUES:{fixture_a}:{fixture_b}")
-                assert fixture_a == "A"
-                assert fixture_b == "B"
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(MULTIPLE_FIXTURES_SRC)
         assert result.returncode == 0, "Test failed"
         assert "VALUES:A:B" in result.stdout
 
     def test_no_fixtures(self):
         """Test without fixtures should work."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
+        result = run_pytest(NO_FIXTURES_SRC)
+        assert result.returncode == 0
+        assert "NO_FIXTURES_NEEDED" in result.stdout
 
-            @concurrent_test
-            def no_fixture_test():
-                print("NO_FIXTURES_NEEDED")
-                assert True
+    def test_wrapped_test_fixtures(self):
+        """A test under a functools.wraps decorator should get its wrapped function's fixtures."""
+        result = run_pytest(WRAPPED_TEST_FIXTURES_SRC)
+        assert result.returncode == 0, "Test failed"
+        assert "WRAPPER_CALLED" in result.stdout
+        assert "WRAPPED_GOT:resource" in result.stdout
 
-            generate_tests(globals())
-        """
-        )
 
-        result = run_pytest(test_code)
-        assert result.returncode == 0
-        assert "NO_FIXTURES_NEEDED" in result.stdout
+RUN_SINGLE_TEST_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
 
+    @concurrent_test
+    def selected():
+        print("SELECTED_RAN")
 
-class TestSingleTestExecution:
-    """Verify that running a single test works correctly."""
+    @concurrent_test
+    def not_selected():
+        print("NOT_SELECTED_RAN")
+
+    generate_tests(globals())
+    """
+)
 
-    def test_run_single_test(self):
-        """Running pytest test_foo should only run that test."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
 
-            @concurrent_test
-            def selected():
-                print("SELECTED_RAN")
+PREFIXED_NAME_NOT_DOUBLED_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
 
-            @concurrent_test
-            def not_selected():
-                print("NOT_SELECTED_RAN")
+    @concurrent_test
+    def test_example():
+        print("TEST_EXAMPLE_RAN")
+
+    generate_tests(globals())
+    """
+)
+
+
+PREFIXED_NAME_RUNS_CORRECTLY_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def test_widget():
+        print("WIDGET_TEST_RAN")
+        assert True
+
+    @concurrent_test
+    def test_gadget():
+        print("GADGET_TEST_RAN")
+        assert True
+
+    generate_tests(globals())
+    """
+)
 
-            generate_tests(globals())
-        """
-        )
 
+class TestSingleTestExecution:
+    """Verify that running a single test works correctly."""
+
+    def test_run_single_test(self):
+        """Running pytest test_foo should only run that test."""
         # Run only test_selected using -k filter
-        result = run_pytest(test_code, "-k", "test_selected")
+        result = run_pytest(RUN_SINGLE_TEST_SRC, "-k", "test_selected")
 
         output = result.stdout + result.stderr
 
@@ -454,19 +985,7 @@ class TestSingleTestExecution:
 
     def test_prefixed_name_not_doubled(self):
         """A parallel test named 'test_foo' should become 'test_foo', not 'test_test_foo'."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def test_example():
-                print("TEST_EXAMPLE_RAN")
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code, "--collect-only")
+        result = run_pytest(PREFIXED_NAME_NOT_DOUBLED_SRC, "--collect-only")
         output = result.stdout + result.stderr
 
         # Should have test_example, NOT test_test_example
@@ -477,26 +996,8 @@ class TestSingleTestExecution:
 
     def test_prefixed_name_runs_correctly(self):
         """A parallel test named 'test_foo' should run when pytest test_foo is invoked."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def test_widget():
-                print("WIDGET_TEST_RAN")
-                assert True
-
-            @concurrent_test
-            def test_gadget():
-                print("GADGET_TEST_RAN")
-                assert True
-
-            generate_tests(globals())
-        """
-        )
-
         # Run only test_widget
-        result = run_pytest(test_code, "-k", "test_widget and not gadget")
+        result = run_pytest(PREFIXED_NAME_RUNS_CORRECTLY_SRC, "-k", "test_widget and not gadget")
         output = result.stdout + result.stderr
 
         # Only widget test should run
@@ -504,26 +1005,178 @@ class TestSingleTestExecution:
         assert "GADGET_TEST_RAN" not in output, "test_gadget should not have run"
 
 
+MODULES_DO_NOT_SHARE_TESTS_A_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def alpha_only():
+        print("ALPHA_ONLY_RAN")
+
+    generate_tests(globals())
+    """
+)
+
+
+MODULES_DO_NOT_SHARE_TESTS_B_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def beta_only():
+        print("BETA_ONLY_RAN")
+
+    generate_tests(globals())
+    """
+)
+
+
+CONCURRENT_HELPERS_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test
+
+    @concurrent_test
+    def shared_check():
+        print("SHARED_CHECK_RAN")
+    """
+)
+
+
+IMPORTED_FUNCTION_SRC = textwrap.dedent(
+    """
+    from concurrent_helpers import shared_check
+    from pytest_threaded import generate_tests
+
+    generate_tests(globals())
+    """
+)
+
+
+IMPORTED_MODULE_SRC = textwrap.dedent(
+    """
+    import concurrent_helpers
+    from pytest_threaded import generate_tests
+
+    generate_tests(globals())
+    """
+)
+
+
+OWN_TEST_WINS_HELPERS_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test
+
+    @concurrent_test
+    def check():
+        print("HELPER_CHECK_RAN")
+    """
+)
+
+
+OWN_TEST_WINS_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def check():
+        print("OWN_CHECK_RAN")
+
+    import own_test_wins_helpers
+
+    generate_tests(globals())
+    """
+)
+
+
+class TestMultipleModules:
+    """Verify that generate_tests only injects the tests that belong to each module."""
+
+    def test_modules_do_not_share_tests(self):
+        """Two modules in one session should each get only their own concurrent tests."""
+        result, outcomes = run_pytest_batch(
+            [MODULES_DO_NOT_SHARE_TESTS_A_SRC, MODULES_DO_NOT_SHARE_TESTS_B_SRC]
+        )
+        assert result.returncode == 0, "Tests failed"
+        assert outcomes == [
+            {"test_all": "passed", "test_alpha_only": "passed"},
+            {"test_all": "passed", "test_beta_only": "passed"},
+        ]
+        assert result.stdout.count("ALPHA_ONLY_RAN") == 1
+        assert result.stdout.count("BETA_ONLY_RAN") == 1
+
+    def test_tests_imported_from_helper_module(self):
+        """Tests defined in a helper module should be generated where they are imported."""
+        # Test files are imported with their directory on sys.path
+        (CACHE_DIR / "concurrent_helpers.py").write_text(CONCURRENT_HELPERS_SRC)
+        result, outcomes = run_pytest_batch([IMPORTED_FUNCTION_SRC, IMPORTED_MODULE_SRC])
+        assert result.returncode == 0, "Tests failed"
+        assert outcomes == [
+            {"test_all": "passed", "test_shared_check": "passed"},
+            {"test_all": "passed", "test_shared_check": "passed"},
+        ]
+
+    def test_own_test_wins_name_clash(self):
+        """A module's own test should not be replaced by an imported test with the same name."""
+        (CACHE_DIR / "own_test_wins_helpers.py").write_text(OWN_TEST_WINS_HELPERS_SRC)
+        result = run_pytest(OWN_TEST_WINS_SRC)
+        assert result.returncode == 0, "Tests failed"
+        assert "OWN_CHECK_RAN" in result.stdout
+        assert "HELPER_CHECK_RAN" not in result.stdout
+
+
+OUTPUT_APPEARS_SRC = textwrap.dedent(
+    """
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def prints_stuff():
+        print("LINE_ONE")
+        print("LINE_TWO")
+        print("LINE_THREE")
+
+    generate_tests(globals())
+    """
+)
+
+
+PARTIAL_LINE_OUTPUT_FLUSHED_SRC = textwrap.dedent(
+    """
+    import sys
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def partial_writer():
+        sys.stdout.write("PARTIAL_")
+        sys.stdout.write("STDOUT")
+        sys.stderr.write("PARTIAL_STDERR")
+
+    generate_tests(globals())
+    """
+)
+
+
+SINGLE_TEST_OUTPUT_STREAMS_SRC = textwrap.dedent(
+    """
+    import time
+    from pytest_threaded import concurrent_test, generate_tests
+
+    @concurrent_test
+    def slow_printer():
+        print("STREAM_START", flush=True)
+        time.sleep(0.5)
+        print("STREAM_END", flush=True)
+
+    generate_tests(globals())
+    """
+)
+
+
 class TestStreamingOutput:
     """Verify that output streams as tests run, not buffered."""
 
     def test_output_appears(self):
         """Test output should appear in pytest output."""
-        test_code = textwrap.dedent(
-            """
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def prints_stuff():
-                print("LINE_ONE")
-                print("LINE_TWO")
-                print("LINE_THREE")
-
-            generate_tests(globals())
-        """
-        )
-
-        result = run_pytest(test_code)
+        result = run_pytest(OUTPUT_APPEARS_SRC)
         output = result.stdout
 
         assert result.returncode == 0
@@ -531,62 +1184,86 @@ class TestStreamingOutput:
         assert "LINE_TWO" in output
         assert "LINE_THREE" in output
 
+    def test_partial_line_output_flushed(self):
+        """Output without a trailing newline should still appear once the test ends."""
+        result = run_pytest(PARTIAL_LINE_OUTPUT_FLUSHED_SRC)
+
+        assert result.returncode == 0
+        assert "PARTIAL_STDOUT" in result.stdout
+        assert "PARTIAL_STDERR" in result.stderr
+
     def test_single_test_output_streams(self):
         """For a single test, output should stream as it runs, not buffer until completion."""
-        test_code = textwrap.dedent(
-            """
-            import time
-            from pytest_threaded import concurrent_test, generate_tests
-
-            @concurrent_test
-            def slow_printer():
-                print("STREAM_START", flush=True)
-                time.sleep(0.5)
-                print("STREAM_END", flush=True)
-
-            generate_tests(globals())
-        """
+        # Run single test and measure timing between output lines
+        test_file = write_test_file(SINGLE_TEST_OUTPUT_STREAMS_SRC)
+        env = os.environ.copy()
+        env["PYTHONPATH"] = f"{PROJECT_ROOT / 'src'}:{env.get('PYTHONPATH', '')}"
+
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                str(test_file),
+                *PYTEST_ARGS,
+                "-k",
+                "slow_printer",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env,
         )
 
-        # Run single test and measure timing between output lines
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", prefix="test_", delete=False) as f:
-            f.write(test_code)
-            f.flush()
-            test_file = f.name
+        start_time = end_time = None
+        for line in process.stdout:
+            sys.stdout.write(line)
+            if "STREAM_START" in line:
+                start_time = time.time()
+            elif "STREAM_END" in line:
+                end_time = time.time()
 
-        try:
-            env = os.environ.copy()
-            env["PYTHONPATH"] = f"{PROJECT_ROOT / 'src'}:{env.get('PYTHONPATH', '')}"
-
-            process = subprocess.Popen(
-                [
-                    sys.executable,
-                    "-m",
-                    "pytest",
-                    test_file,
-                    "-v",
-                    "-s",
-                    "-k",
-                    "slow_printer",
-                ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                env=env,
-            )
-
-            start_time = end_time = None
-            for line in process.stdout:
-                sys.stdout.write(line)
-                if "STREAM_START" in line:
-                    start_time = time.time()
-                elif "STREAM_END" in line:
-                    end_time = time.time()
+        wait_for_exit(process, timeout=30)
 
-            process.wait()
+        assert start_time and end_time, "Output markers not found"
+        delay = end_time - start_time
+        assert 0.3 < delay < 0.8, f"Output not streaming (delay: {delay:.2f}s, expected ~0.5s)"
+
+
+SLOW_EXIT_SRC = textwrap.dedent(
+    """
+    import os
+    import time
+
+    os.close(1)
+    os.close(2)
+    time.sleep(10)
+    """
+)
+
+
+class TestRunSubprocess:
+    """Verify the subprocess helpers used by the tests above."""
+
+    def test_timeout_kills_child(self):
+        """A child that outlives the timeout after closing its pipes should be killed."""
+        start = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+            run_subprocess([sys.executable, "-c", SLOW_EXIT_SRC], timeout=1)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 5, f"Took {elapsed:.2f}s - child was not killed at the timeout"
+        assert excinfo.value.timeout == 1
+
+    def test_fresh_interpreter_run(self, capsys):
+        """use_worker=False should run pytest in a new interpreter and echo its output."""
+        result = run_pytest(PARTIAL_LINE_OUTPUT_FLUSHED_SRC, use_worker=False)
+
+        assert result.returncode == 0
+        assert "PARTIAL_STDOUT" in result.stdout
+        assert "PARTIAL_STDERR" in result.stderr
 
-            assert start_time and end_time, "Output markers not found"
-            delay = end_time - start_time
-            assert 0.3 < delay < 0.8, f"Output not streaming (delay: {delay:.2f}s, expected ~0.5s)"
-        finally:
-            os.unlink(test_file)
+        # Both streams are echoed to the host as they arrive
+        echoed = capsys.readouterr()
+        assert "PARTIAL_STDOUT" in echoed.out
+        assert "PARTIAL_STDERR" in echoed.err